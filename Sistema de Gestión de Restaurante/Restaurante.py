@@ -4,12 +4,18 @@
 Sistema de Administración de Restaurante
 Autor: Marcos Soto / MCode-DevOps93
 Descripción: Sistema completo para gestionar platillos y órdenes de un restaurante
-con persistencia de datos en archivos .txt
+con persistencia de datos en archivos .txt y .json
 """
 
 
+from bisect import insort
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import json
+import logging
 import os
+import sys
 
 # ==================== CONFIGURACIÓN GLOBAL ====================
 # Definición de las carpetas donde se almacenarán los archivos
@@ -18,6 +24,18 @@ CARPETA_ORDENES = 'restaurant/ordenes/'               # Carpeta para guardar las
 CARPETA_ORDENES_GUARDADAS = 'Ordenes Guardadas/'      # Carpeta para guardar reportes de órdenes
 CARPETA_CIERRE_CAJA = 'Cierre de caja/'               # Carpeta para guardar cierre de caja
 EXTENSION = '.txt'                                     # Extensión de los archivos
+PREFIJO_ORDEN = 'orden_'                               # Inicio del nombre de los archivos de órdenes
+ARCHIVO_PLATILLOS = 'restaurant/platillos.json'        # Archivo único con todos los platillos
+LIMITE_LOG = 500                                       # Mensajes acumulados antes de mostrarse (modo no interactivo)
+
+# Valores del campo "Disponible" de los .txt antiguos que se leen como disponible
+VALORES_VERDADEROS = frozenset({'True', 'true', 'TRUE', '1', 'yes'})
+
+# Registro para los errores al cargar datos (sin configurar, los avisos salen por stderr)
+log = logging.getLogger(__name__)
+
+# Plantilla de la línea por orden del cierre de caja (se reutiliza en cada iteración)
+FORMATO_LINEA_CIERRE = "Orden #{:<3} - {:<20} ${:>12,.0f}"
 
 
 # ==================== CLASE PLATILLO ====================
@@ -25,12 +43,25 @@ class Platillo:
     """
     Clase que representa un platillo del menú del restaurant
     """
-    def __init__(self, id_platillo, nombre, precio, categoria):
+    __slots__ = ('id_platillo', 'nombre', 'precio', 'categoria', 'disponible')
+
+    def __init__(self, id_platillo, nombre, precio, categoria, disponible=True):
         self.id_platillo = id_platillo
         self.nombre = nombre
         self.precio = precio
-        self.categoria = categoria
-        self.disponible = True
+        # Las categorías se repiten en muchos platillos: se comparte una sola copia de cada texto
+        self.categoria = sys.intern(categoria)
+        self.disponible = disponible
+
+    def a_diccionario(self):
+        """Devuelve los datos del platillo listos para guardarse en JSON"""
+        return {
+            'id_platillo': self.id_platillo,
+            'nombre': self.nombre,
+            'precio': self.precio,
+            'categoria': self.categoria,
+            'disponible': self.disponible,
+        }
 
     def __str__(self):
         """Método para mostrar el platillo en formato legible"""
@@ -38,31 +69,54 @@ class Platillo:
         return f"[{self.id_platillo}] {self.nombre} - ${self.precio:,.0f} ({self.categoria}) {estado}"
 
 
+# ==================== CLASE ITEM DE ORDEN ====================
+class OrdenItem:
+    """
+    Clase que representa una línea de una orden: un platillo, su cantidad y subtotal
+    """
+    __slots__ = ('platillo', 'cantidad', 'subtotal', 'categoria')
+
+    def __init__(self, platillo, cantidad, subtotal):
+        self.platillo = platillo
+        self.cantidad = cantidad
+        self.subtotal = subtotal
+        # Categoría al momento de la venta (no cambia si después se edita el platillo)
+        self.categoria = platillo.categoria
+
+
 # ==================== CLASE ORDEN ====================
 class Orden:
     """
     Clase que representa una orden del restaurant
     """
+    __slots__ = ('numero_orden', 'cliente', 'platillos', 'fecha', 'total', '_fecha_str')
+
     def __init__(self, numero_orden, cliente):
         self.numero_orden = numero_orden
         self.cliente = cliente
         self.platillos = []
         self.fecha = datetime.now()
         self.total = 0
+        self._fecha_str = None
 
     def agregar_platillo(self, platillo, cantidad=1):
-        """Agrega un platillo a la orden con su cantidad y calcula el subtotal"""
-        self.platillos.append({
-            'platillo': platillo,
-            'cantidad': cantidad,
-            'subtotal': platillo.precio * cantidad
-        })
-        self.total += platillo.precio * cantidad
+        """Agrega un platillo a la orden con su cantidad, calcula el subtotal y devuelve el item"""
+        subtotal = platillo.precio * cantidad
+        item = OrdenItem(platillo, cantidad, subtotal)
+        self.platillos.append(item)
+        self.total += subtotal
+        return item
+
+    @property
+    def fecha_str(self):
+        """Fecha de la orden formateada (se calcula una sola vez, la fecha no cambia)"""
+        if self._fecha_str is None:
+            self._fecha_str = self.fecha.strftime("%d/%m/%Y %H:%M")
+        return self._fecha_str
 
     def __str__(self):
         """Método para mostrar la orden en formato legible"""
-        fecha_str = self.fecha.strftime("%d/%m/%Y %H:%M")
-        return f"Orden #{self.numero_orden} - {self.cliente} - ${self.total:,.0f} ({fecha_str})"
+        return f"Orden #{self.numero_orden} - {self.cliente} - ${self.total:,.0f} ({self.fecha_str})"
 
 
 # ==================== CLASE CIERRE DE CAJA ====================
@@ -70,36 +124,15 @@ class CierreCaja:
     """
     Clase que representa un cierre de caja diario
     """
-    def __init__(self, ordenes):
+    def __init__(self, ordenes, total_ingresos, platillos_vendidos, categorias):
+        """Recibe los totales ya acumulados por el restaurant para no recorrer las órdenes"""
         self.fecha_cierre = datetime.now()
         self.ordenes = ordenes
         self.total_ordenes = len(ordenes)
-        self.total_ingresos = sum(orden.total for orden in ordenes)
+        self.total_ingresos = total_ingresos
         self.promedio_orden = self.total_ingresos / self.total_ordenes if self.total_ordenes > 0 else 0
-        self.platillos_vendidos = self._calcular_platillos_vendidos()
-        self.categoria_mas_vendida = self._categoria_mas_vendida()
-
-    def _calcular_platillos_vendidos(self):
-        """Calcula el total de platillos vendidos"""
-        total = 0
-        for orden in self.ordenes:
-            for item in orden.platillos:
-                total += item['cantidad']
-        return total
-
-    def _categoria_mas_vendida(self):
-        """Determina la categoría más vendida"""
-        categorias = {}
-        for orden in self.ordenes:
-            for item in orden.platillos:
-                categoria = item['platillo'].categoria
-                if categoria not in categorias:
-                    categorias[categoria] = 0
-                categorias[categoria] += item['cantidad']
-        
-        if categorias:
-            return max(categorias.items(), key=lambda x: x[1])
-        return None
+        self.platillos_vendidos = platillos_vendidos
+        self.categoria_mas_vendida = categorias.most_common(1)[0] if categorias else None
 
     def __str__(self):
         """Método para mostrar el cierre de caja en formato legible"""
@@ -111,79 +144,153 @@ class Restaurant:
     """
     Clase principal que gestiona todo el sistema del restaurant
     """
-    def __init__(self):
-        """Inicializa el sistema del restaurant y carga los datos existentes"""
-        self.platillos = {}
-        self.ordenes = []
-        self.contador_ordenes = 1
+    def __init__(self, interactivo=True):
+        """
+        Inicializa el sistema del restaurant. Los datos guardados se cargan
+        desde disco la primera vez que se necesitan.
+        Con interactivo=False no se hacen pausas ni preguntas de confirmación
+        y los mensajes se acumulan en memoria (útil para cargas masivas desde
+        otro script). En ese modo conviene usarlo con 'with' para que los
+        mensajes pendientes se muestren al terminar:
+
+            with Restaurant(interactivo=False) as restaurant:
+                restaurant.registrar_orden("Ana", [("P001", 2), ("B001", 1)])
+        """
+        self.interactivo = interactivo
+        self._log_buffer = []
+        self._platillos = None                              # Se carga al primer uso (ver propiedad platillos)
+        self._platillos_por_categoria = defaultdict(list)   # Índice del menú por categoría
+        self._categorias_ordenadas = []                     # (clave de orden, categoría) en orden alfabético
+        self._menu_version = 0                              # Aumenta cada vez que cambia el menú
+        self.ordenes = {}           # Órdenes indexadas por número de orden
+        self._contador_ordenes = None                       # Se calcula al primer uso
         self.cierre_caja = None
-        self.cargar_datos()
+        # Totales acumulados de las órdenes registradas (se usan en el cierre de caja)
+        self._agg_total = 0
+        self._agg_items = 0
+        self._agg_cats = Counter()
+
+    @property
+    def platillos(self):
+        """Platillos del menú indexados por ID (se cargan la primera vez que se usan)"""
+        if self._platillos is None:
+            self.cargar_platillos()
+        return self._platillos
+
+    @platillos.setter
+    def platillos(self, platillos):
+        self._platillos = platillos
+
+    @property
+    def contador_ordenes(self):
+        """Número que recibirá la próxima orden (se calcula la primera vez que se usa)"""
+        if self._contador_ordenes is None:
+            self._contador_ordenes = 1
+            self.cargar_ordenes()
+        return self._contador_ordenes
+
+    @contador_ordenes.setter
+    def contador_ordenes(self, numero):
+        self._contador_ordenes = numero
+
+    # ==================== MENSAJES Y PAUSAS ====================
+
+    def _log(self, mensaje=""):
+        """Muestra un mensaje, o lo acumula si el sistema no es interactivo"""
+        if self.interactivo:
+            print(mensaje)
+            return
+        self._log_buffer.append(str(mensaje))
+        if len(self._log_buffer) >= LIMITE_LOG:
+            self.vaciar_log()
+
+    def vaciar_log(self):
+        """Muestra de una sola vez los mensajes acumulados"""
+        if self._log_buffer:
+            sys.stdout.write("\n".join(self._log_buffer) + "\n")
+            self._log_buffer.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        """Al salir del bloque 'with' se muestran los mensajes que quedaron acumulados"""
+        self.vaciar_log()
+        return False
+
+    def pausar(self):
+        """Espera que el usuario presione Enter (solo en modo interactivo)"""
+        if self.interactivo:
+            input("\nPresione Enter para volver al menú...")
+
+    def _confirmar(self, pregunta):
+        """Pide confirmación (s/n) al usuario; sin modo interactivo se da por confirmado"""
+        if not self.interactivo:
+            return True
+        return input(pregunta).strip().lower() == 's'
 
     # ==================== CRUD DE PLATILLOS ====================
 
     def agregar_platillo(self, id_platillo, nombre, precio, categoria):
         """Crea un nuevo platillo en el sistema"""
         if id_platillo in self.platillos:
-            print("❌ El ID del platillo ya existe.")
+            self._log("❌ El ID del platillo ya existe.")
             return False
         
         try:
             precio = float(precio)
             platillo = Platillo(id_platillo, nombre, precio, categoria)
             self.platillos[id_platillo] = platillo
+            self._indexar_platillo(platillo)
+            self._menu_version += 1
             self.guardar_platillo(platillo)
-            print("✅ Platillo agregado correctamente.")
+            self._log("✅ Platillo agregado correctamente.")
             return True
         except ValueError:
-            print("❌ El precio debe ser un número válido.")
+            self._log("❌ El precio debe ser un número válido.")
             return False
 
     def mostrar_platillos(self):
         """Muestra todos los platillos del menú organizados por categoría"""
-        print("\n" + "="*60)
-        print("🍽️  MENÚ DEL RESTAURANT")
-        print("="*60)
+        self._log("\n" + "="*60)
+        self._log("🍽️  MENÚ DEL RESTAURANT")
+        self._log("="*60)
         
         if not self.platillos:
-            print("No hay platillos registrados.")
+            self._log("No hay platillos registrados.")
             return
         
-        categorias = {}
-        for platillo in self.platillos.values():
-            if platillo.categoria not in categorias:
-                categorias[platillo.categoria] = []
-            categorias[platillo.categoria].append(platillo)
-        
-        for categoria, platillos in categorias.items():
-            print(f"\n📋 {categoria.upper()}:")
-            print("-" * 60)
+        for _, categoria in self._categorias_ordenadas:
+            platillos = self._platillos_por_categoria[categoria]
+            self._log(f"\n📋 {categoria.upper()}:")
+            self._log("-" * 60)
             for platillo in platillos:
-                print(f"  {platillo}")
+                self._log(f"  {platillo}")
 
     def buscar_platillo(self, id_platillo):
         """Busca y muestra la información de un platillo específico"""
         if id_platillo in self.platillos:
             platillo = self.platillos[id_platillo]
-            print("\n🔍 Platillo encontrado:")
-            print(f"  ID: {platillo.id_platillo}")
-            print(f"  Nombre: {platillo.nombre}")
-            print(f"  Precio: ${platillo.precio:,.0f}")
-            print(f"  Categoría: {platillo.categoria}")
-            print(f"  Disponible: {'Sí' if platillo.disponible else 'No'}")
+            self._log("\n🔍 Platillo encontrado:")
+            self._log(f"  ID: {platillo.id_platillo}")
+            self._log(f"  Nombre: {platillo.nombre}")
+            self._log(f"  Precio: ${platillo.precio:,.0f}")
+            self._log(f"  Categoría: {platillo.categoria}")
+            self._log(f"  Disponible: {'Sí' if platillo.disponible else 'No'}")
             return platillo
         else:
-            print("❌ Platillo no encontrado.")
+            self._log("❌ Platillo no encontrado.")
             return None
 
     def editar_platillo(self, id_platillo):
         """Permite editar los datos de un platillo existente"""
         if id_platillo not in self.platillos:
-            print("❌ Platillo no encontrado.")
+            self._log("❌ Platillo no encontrado.")
             return False
         
         platillo = self.platillos[id_platillo]
-        print(f"\n📝 Editando: {platillo.nombre}")
-        print("(Presiona Enter para mantener el valor actual)")
+        self._log(f"\n📝 Editando: {platillo.nombre}")
+        self._log("(Presiona Enter para mantener el valor actual)")
         
         nuevo_nombre = input(f"Nombre [{platillo.nombre}]: ").strip()
         nuevo_precio = input(f"Precio [${platillo.precio:,.0f}]: ").strip()
@@ -196,79 +303,105 @@ class Restaurant:
             try:
                 platillo.precio = float(nuevo_precio)
             except ValueError:
-                print("⚠️ Precio inválido, se mantiene el anterior.")
-        if nueva_categoria:
-            platillo.categoria = nueva_categoria
+                self._log("⚠️ Precio inválido, se mantiene el anterior.")
+        if nueva_categoria and nueva_categoria != platillo.categoria:
+            self._desindexar_platillo(platillo)
+            platillo.categoria = sys.intern(nueva_categoria)
+            self._indexar_platillo(platillo)
         if disponible:
             platillo.disponible = disponible == 's'
         
+        self._menu_version += 1
         self.actualizar_platillo(platillo)
-        print("✅ Platillo actualizado correctamente.")
+        self._log("✅ Platillo actualizado correctamente.")
         return True
 
     def eliminar_platillo(self, id_platillo):
         """Elimina un platillo del sistema y su archivo correspondiente"""
         if id_platillo not in self.platillos:
-            print("❌ Platillo no encontrado.")
+            self._log("❌ Platillo no encontrado.")
             return False
         
         platillo = self.platillos[id_platillo]
-        confirmacion = input(f"¿Está seguro de eliminar '{platillo.nombre}'? (s/n): ").strip().lower()
-        
-        if confirmacion == 's':
+        if self._confirmar(f"¿Está seguro de eliminar '{platillo.nombre}'? (s/n): "):
             del self.platillos[id_platillo]
+            self._desindexar_platillo(platillo)
+            self._menu_version += 1
             try:
-                os.remove(CARPETA_PLATILLOS + id_platillo + EXTENSION)
-                print("✅ Platillo eliminado correctamente.")
+                self._guardar_platillos()
+                # Si el platillo venía de un archivo .txt antiguo también se elimina
+                ruta_txt = CARPETA_PLATILLOS + id_platillo + EXTENSION
+                if os.path.exists(ruta_txt):
+                    os.remove(ruta_txt)
+                self._log("✅ Platillo eliminado correctamente.")
                 return True
             except OSError as e:
-                print(f"⚠️ Error al eliminar el archivo: {e}")
+                self._log(f"⚠️ Error al eliminar el archivo: {e}")
                 return False
         else:
-            print("❌ Eliminación cancelada.")
+            self._log("❌ Eliminación cancelada.")
             return False
 
+    def _indexar_platillo(self, platillo):
+        """Agrega el platillo al índice de categorías del menú"""
+        if platillo.categoria not in self._platillos_por_categoria:
+            # Se ordena sin distinguir mayúsculas, igual que se muestra en el menú
+            insort(self._categorias_ordenadas, (platillo.categoria.casefold(), platillo.categoria))
+        self._platillos_por_categoria[platillo.categoria].append(platillo)
+
+    def _desindexar_platillo(self, platillo):
+        """Quita el platillo del índice de categorías del menú"""
+        platillos = self._platillos_por_categoria[platillo.categoria]
+        platillos.remove(platillo)
+        if not platillos:
+            del self._platillos_por_categoria[platillo.categoria]
+            self._categorias_ordenadas.remove((platillo.categoria.casefold(), platillo.categoria))
+
     # ==================== GESTIÓN DE ÓRDENES ====================
 
     def crear_orden(self):
         """Crea una nueva orden para un cliente"""
-        print("\n" + "="*60)
-        print("🛒 CREAR NUEVA ORDEN")
-        print("="*60)
+        self._log("\n" + "="*60)
+        self._log("🛒 CREAR NUEVA ORDEN")
+        self._log("="*60)
         
         cliente = input("Nombre del cliente (0 para cancelar): ").strip()
         if cliente == '0':
-            print("❌ Creación de orden cancelada.")
-            input("\nPresione Enter para volver al menú...")
+            self._log("❌ Creación de orden cancelada.")
+            self.pausar()
             return
         
         if not cliente:
-            print("❌ Debe ingresar el nombre del cliente.")
-            input("\nPresione Enter para volver al menú...")
+            self._log("❌ Debe ingresar el nombre del cliente.")
+            self.pausar()
             return
         
         orden = Orden(self.contador_ordenes, cliente)
         
-        print("\n📋 Agregando platillos a la orden...")
-        print("💡 Tip: Ingrese '0' en cualquier momento para cancelar la orden")
+        self._log("\n📋 Agregando platillos a la orden...")
+        self._log("💡 Tip: Ingrese '0' en cualquier momento para cancelar la orden")
         
+        # El menú solo se vuelve a mostrar si cambió desde la última vez
+        menu_mostrado = -1
         while True:
-            self.mostrar_platillos()
+            if menu_mostrado != self._menu_version:
+                self.mostrar_platillos()
+                menu_mostrado = self._menu_version
             
             id_platillo = input("\nID del platillo (0 para cancelar orden): ").strip()
             
             if id_platillo == '0':
                 confirmacion = input("\n⚠️  ¿Está seguro de cancelar esta orden? (s/n): ").strip().lower()
                 if confirmacion == 's':
-                    print("❌ Orden cancelada.")
-                    input("\nPresione Enter para volver al menú...")
+                    self._log("❌ Orden cancelada.")
+                    self.pausar()
                     return
                 else:
-                    print("✅ Continuando con la orden...")
+                    self._log("✅ Continuando con la orden...")
                     continue
             
             if id_platillo not in self.platillos:
-                print("❌ Platillo no encontrado.")
+                self._log("❌ Platillo no encontrado.")
                 continuar = input("\n¿Desea intentar con otro platillo? (s/n): ").strip().lower()
                 if continuar != 's':
                     break
@@ -277,7 +410,7 @@ class Restaurant:
             platillo = self.platillos[id_platillo]
             
             if not platillo.disponible:
-                print("⚠️ Este platillo no está disponible.")
+                self._log("⚠️ Este platillo no está disponible.")
                 continuar = input("\n¿Desea seleccionar otro platillo? (s/n): ").strip().lower()
                 if continuar != 's':
                     break
@@ -289,503 +422,713 @@ class Restaurant:
                 if cantidad == '0':
                     confirmacion = input("\n⚠️  ¿Está seguro de cancelar esta orden? (s/n): ").strip().lower()
                     if confirmacion == 's':
-                        print("❌ Orden cancelada.")
-                        input("\nPresione Enter para volver al menú...")
+                        self._log("❌ Orden cancelada.")
+                        self.pausar()
                         return
                     else:
-                        print("✅ Continuando con la orden...")
+                        self._log("✅ Continuando con la orden...")
                         continue
                 
                 cantidad = int(cantidad)
                 
                 if cantidad <= 0:
-                    print("❌ La cantidad debe ser mayor a 0.")
+                    self._log("❌ La cantidad debe ser mayor a 0.")
                     continuar = input("\n¿Desea intentar nuevamente? (s/n): ").strip().lower()
                     if continuar != 's':
                         break
                     continue
                 
-                orden.agregar_platillo(platillo, cantidad)
-                print(f"✅ Agregado: {cantidad}x {platillo.nombre} = ${platillo.precio * cantidad:,.0f}")
-                print(f"💰 Subtotal actual: ${orden.total:,.0f}")
+                item = orden.agregar_platillo(platillo, cantidad)
+                self._log(f"✅ Agregado: {cantidad}x {platillo.nombre} = ${item.subtotal:,.0f}")
+                self._log(f"💰 Subtotal actual: ${orden.total:,.0f}")
                 
             except ValueError:
-                print("❌ Cantidad inválida.")
+                self._log("❌ Cantidad inválida.")
                 continuar = input("\n¿Desea intentar nuevamente? (s/n): ").strip().lower()
                 if continuar != 's':
                     break
                 continue
             
-            print("\n" + "-"*60)
+            self._log("\n" + "-"*60)
             agregar_mas = input("¿Desea agregar más platillos a la orden? (s/n): ").strip().lower()
             
             if agregar_mas != 's':
-                print("🔚 Finalizando orden...")
+                self._log("🔚 Finalizando orden...")
                 break
         
         if len(orden.platillos) == 0:
-            print("\n⚠️ No se agregaron platillos. Orden cancelada.")
-            input("\nPresione Enter para volver al menú...")
+            self._log("\n⚠️ No se agregaron platillos. Orden cancelada.")
+            self.pausar()
             return
         
-        self.ordenes.append(orden)
+        self._completar_orden(orden)
+        self.pausar()
+
+    def registrar_orden(self, cliente, items):
+        """
+        Crea una orden sin hacer preguntas a partir de una lista de (id_platillo, cantidad).
+        Pensado para cargas desde otro script: devuelve la orden creada o None si algún dato no es válido.
+        """
+        cliente = cliente.strip()
+        if not cliente:
+            self._log("❌ Debe ingresar el nombre del cliente.")
+            return None
+        
+        orden = Orden(self.contador_ordenes, cliente)
+        for id_platillo, cantidad in items:
+            platillo = self.platillos.get(id_platillo)
+            if platillo is None:
+                self._log(f"❌ Platillo no encontrado: {id_platillo}")
+                return None
+            if not platillo.disponible:
+                self._log(f"⚠️ El platillo {id_platillo} no está disponible.")
+                return None
+            try:
+                cantidad = int(cantidad)
+            except (TypeError, ValueError):
+                self._log(f"❌ Cantidad inválida para {id_platillo}.")
+                return None
+            if cantidad <= 0:
+                self._log("❌ La cantidad debe ser mayor a 0.")
+                return None
+            orden.agregar_platillo(platillo, cantidad)
+        
+        if len(orden.platillos) == 0:
+            self._log("⚠️ No se agregaron platillos. Orden cancelada.")
+            return None
+        
+        self._completar_orden(orden)
+        return orden
+
+    def _completar_orden(self, orden):
+        """Registra una orden ya armada: la guarda, suma sus totales y avanza el contador"""
+        # Primero se guarda el archivo: si falla, la orden no queda registrada a medias
         self.guardar_orden(orden)
+        self.ordenes[orden.numero_orden] = orden
+        self._acumular_orden(orden)
         self.contador_ordenes += 1
         
-        print("\n" + "="*60)
-        print("✅ ORDEN CREADA EXITOSAMENTE")
-        print("="*60)
+        self._log("\n" + "="*60)
+        self._log("✅ ORDEN CREADA EXITOSAMENTE")
+        self._log("="*60)
         self.mostrar_detalle_orden(orden)
-        input("\nPresione Enter para volver al menú...")
 
     def mostrar_detalle_orden(self, orden):
         """Muestra el detalle completo de una orden"""
-        print(f"\n🧾 Orden #{orden.numero_orden}")
-        print(f"Cliente: {orden.cliente}")
-        print(f"Fecha: {orden.fecha.strftime('%d/%m/%Y %H:%M')}")
-        print("-" * 60)
+        lineas = [
+            f"\n🧾 Orden #{orden.numero_orden}",
+            f"Cliente: {orden.cliente}",
+            f"Fecha: {orden.fecha_str}",
+            "-" * 60,
+        ]
         
         for item in orden.platillos:
-            platillo = item['platillo']
-            cantidad = item['cantidad']
-            subtotal = item['subtotal']
-            print(f"  {cantidad}x {platillo.nombre:<30} ${subtotal:>10,.0f}")
+            lineas.append(f"  {item.cantidad}x {item.platillo.nombre:<30} ${item.subtotal:>10,.0f}")
         
-        print("-" * 60)
-        print(f"{'TOTAL:':<35} ${orden.total:>10,.0f}")
-        print("="*60)
+        lineas.append("-" * 60)
+        lineas.append(f"{'TOTAL:':<35} ${orden.total:>10,.0f}")
+        lineas.append("="*60)
+        self._log("\n".join(lineas))
 
     def mostrar_ordenes(self):
         """Muestra un resumen de todas las órdenes registradas"""
-        print("\n" + "="*60)
-        print("📋 HISTORIAL DE ÓRDENES")
-        print("="*60)
+        self._log("\n" + "="*60)
+        self._log("📋 HISTORIAL DE ÓRDENES")
+        self._log("="*60)
         
         if not self.ordenes:
-            print("No hay órdenes registradas.")
+            self._log("No hay órdenes registradas.")
             return
         
-        for orden in self.ordenes:
-            print(orden)
+        for orden in self.ordenes.values():
+            self._log(orden)
 
     def buscar_orden(self, numero_orden):
         """Busca y muestra el detalle completo de una orden específica"""
         try:
             numero_orden = int(numero_orden)
-            for orden in self.ordenes:
-                if orden.numero_orden == numero_orden:
-                    self.mostrar_detalle_orden(orden)
-                    return orden
-            print("❌ Orden no encontrada.")
+            orden = self.ordenes.get(numero_orden)
+            if orden is not None:
+                self.mostrar_detalle_orden(orden)
+                return orden
+            self._log("❌ Orden no encontrada.")
             return None
         except ValueError:
-            print("❌ Número de orden inválido.")
+            self._log("❌ Número de orden inválido.")
             return None
 
     def eliminar_orden(self, numero_orden):
         """Elimina una orden del sistema y su archivo correspondiente"""
         try:
             numero_orden = int(numero_orden)
-            orden_encontrada = None
+            orden = self.ordenes.get(numero_orden)
             
-            for i, orden in enumerate(self.ordenes):
-                if orden.numero_orden == numero_orden:
-                    orden_encontrada = (i, orden)
-                    break
-            
-            if not orden_encontrada:
-                print("❌ Orden no encontrada.")
+            if orden is None:
+                self._log("❌ Orden no encontrada.")
                 return False
             
-            indice, orden = orden_encontrada
-            
-            print("\n📋 Orden a eliminar:")
+            self._log("\n📋 Orden a eliminar:")
             self.mostrar_detalle_orden(orden)
             
-            confirmacion = input("\n⚠️  ¿Está seguro de eliminar esta orden? (s/n): ").strip().lower()
-            
-            if confirmacion == 's':
-                del self.ordenes[indice]
-                
+            if self._confirmar("\n⚠️  ¿Está seguro de eliminar esta orden? (s/n): "):
                 try:
-                    archivos = os.listdir(CARPETA_ORDENES)
-                    for archivo in archivos:
-                        if archivo.startswith(f'orden_{orden.numero_orden:04d}_'):
-                            os.remove(CARPETA_ORDENES + archivo)
-                            break
+                    prefijo = f'{PREFIJO_ORDEN}{orden.numero_orden:04d}_'
+                    with os.scandir(CARPETA_ORDENES) as entradas:
+                        for entrada in entradas:
+                            if entrada.name.startswith(prefijo):
+                                os.remove(entrada.path)
+                                break
                     
-                    print(f"\n✅ Orden #{numero_orden} eliminada correctamente.")
+                    # Los totales se descuentan solo cuando el archivo ya se eliminó
+                    del self.ordenes[numero_orden]
+                    self._descontar_orden(orden)
+                    self._log(f"\n✅ Orden #{numero_orden} eliminada correctamente.")
                     return True
                 except OSError as e:
-                    print(f"⚠️ Error al eliminar el archivo: {e}")
+                    self._log(f"⚠️ Error al eliminar el archivo: {e}")
                     return False
             else:
-                print("❌ Eliminación cancelada.")
+                self._log("❌ Eliminación cancelada.")
                 return False
                 
         except ValueError:
-            print("❌ Número de orden inválido.")
+            self._log("❌ Número de orden inválido.")
             return False
 
+    def _acumular_orden(self, orden):
+        """Suma los totales de una orden a los acumulados del restaurant (una vez guardado su archivo)"""
+        self._agg_total += orden.total
+        for item in orden.platillos:
+            self._agg_items += item.cantidad
+            self._agg_cats[item.categoria] += item.cantidad
+
+    def _descontar_orden(self, orden):
+        """Resta los totales de una orden eliminada de los acumulados del restaurant (una vez borrado su archivo)"""
+        self._agg_total -= orden.total
+        for item in orden.platillos:
+            self._agg_items -= item.cantidad
+            self._agg_cats[item.categoria] -= item.cantidad
+            # Se descartan las categorías que quedaron sin ventas
+            if self._agg_cats[item.categoria] == 0:
+                del self._agg_cats[item.categoria]
+
+    @property
+    def total_ingresos(self):
+        """Total de ingresos de las órdenes registradas"""
+        return self._agg_total
+
+    @property
+    def total_ordenes(self):
+        """Cantidad de órdenes registradas"""
+        return len(self.ordenes)
+
     # ==================== CIERRE DE CAJA ====================
 
     def generar_cierre_caja(self):
         """Genera un cierre de caja con todos los totales del día"""
         if not self.ordenes:
-            print("❌ No hay órdenes registradas. No es posible generar cierre de caja.")
+            self._log("❌ No hay órdenes registradas. No es posible generar cierre de caja.")
             return
         
-        self.cierre_caja = CierreCaja(self.ordenes)
-        print("\n✅ Cierre de caja generado correctamente.")
+        self.cierre_caja = CierreCaja(list(self.ordenes.values()), self._agg_total, self._agg_items, self._agg_cats)
+        self._log("\n✅ Cierre de caja generado correctamente.")
 
     def mostrar_cierre_caja(self):
         """Muestra el cierre de caja con todas sus estadísticas"""
         if self.cierre_caja is None:
-            print("❌ No hay cierre de caja generado.")
-            print("   Por favor, genere un cierre de caja primero.")
+            self._log("❌ No hay cierre de caja generado.")
+            self._log("   Por favor, genere un cierre de caja primero.")
             return
         
         cierre = self.cierre_caja
         
-        print("\n" + "="*80)
-        print("💰 CIERRE DE CAJA DEL DÍA")
-        print("="*80)
-        print(f"\nFecha de Cierre: {cierre.fecha_cierre.strftime('%d/%m/%Y %H:%M:%S')}")
-        print("\n" + "-"*80)
-        print("RESUMEN ESTADÍSTICO:")
-        print("-"*80)
-        print(f"📊 Total de órdenes:        {cierre.total_ordenes}")
-        print(f"💰 Total de ingresos:       ${cierre.total_ingresos:,.0f}")
-        print(f"📈 Promedio por orden:      ${cierre.promedio_orden:,.0f}")
-        print(f"🍽️  Total de platillos:      {cierre.platillos_vendidos}")
+        lineas = [
+            "\n" + "="*80,
+            "💰 CIERRE DE CAJA DEL DÍA",
+            "="*80,
+            f"\nFecha de Cierre: {cierre.fecha_cierre.strftime('%d/%m/%Y %H:%M:%S')}",
+            "\n" + "-"*80,
+            "RESUMEN ESTADÍSTICO:",
+            "-"*80,
+            f"📊 Total de órdenes:        {cierre.total_ordenes}",
+            f"💰 Total de ingresos:       ${cierre.total_ingresos:,.0f}",
+            f"📈 Promedio por orden:      ${cierre.promedio_orden:,.0f}",
+            f"🍽️  Total de platillos:      {cierre.platillos_vendidos}",
+        ]
         
         if cierre.categoria_mas_vendida:
             categoria, cantidad = cierre.categoria_mas_vendida
-            print(f"⭐ Categoría más vendida:   {categoria} ({cantidad} platillos)")
+            lineas.append(f"⭐ Categoría más vendida:   {categoria} ({cantidad} platillos)")
         
-        print("\n" + "-"*80)
-        print("DETALLES POR ORDEN:")
-        print("-"*80)
+        lineas.append("\n" + "-"*80)
+        lineas.append("DETALLES POR ORDEN:")
+        lineas.append("-"*80)
         
         for orden in cierre.ordenes:
-            print(f"Orden #{orden.numero_orden:<3} - {orden.cliente:<20} ${orden.total:>12,.0f}")
+            lineas.append(FORMATO_LINEA_CIERRE.format(orden.numero_orden, orden.cliente, orden.total))
         
-        print("\n" + "="*80)
-        print(f"{'TOTAL FINAL:':<40} ${cierre.total_ingresos:>12,.0f}")
-        print("="*80)
+        lineas.append("\n" + "="*80)
+        lineas.append(f"{'TOTAL FINAL:':<40} ${cierre.total_ingresos:>12,.0f}")
+        lineas.append("="*80)
+        self._log("\n".join(lineas))
 
     def guardar_cierre_caja(self):
         """Guarda el cierre de caja en el directorio 'Cierre de caja' organizado por fecha"""
         if self.cierre_caja is None:
-            print("❌ No hay cierre de caja generado.")
-            print("   Por favor, genere un cierre de caja primero.")
+            self._log("❌ No hay cierre de caja generado.")
+            self._log("   Por favor, genere un cierre de caja primero.")
             return
         
         try:
-            if not os.path.exists(CARPETA_CIERRE_CAJA):
-                os.makedirs(CARPETA_CIERRE_CAJA)
-            
-            fecha_actual = datetime.now().strftime("%Y-%m-%d")
+            ahora = datetime.now()
+            fecha_actual = ahora.strftime("%Y-%m-%d")
             ruta_fecha = os.path.join(CARPETA_CIERRE_CAJA, fecha_actual)
+            # Crea la carpeta del día (y la carpeta principal) si aún no existen
+            os.makedirs(ruta_fecha, exist_ok=True)
             
-            if not os.path.exists(ruta_fecha):
-                os.makedirs(ruta_fecha)
-            
-            hora_actual = datetime.now().strftime("%H-%M-%S")
+            hora_actual = ahora.strftime("%H-%M-%S")
             nombre_archivo = f"cierre_caja_{hora_actual}{EXTENSION}"
             ruta_completa = os.path.join(ruta_fecha, nombre_archivo)
             
             cierre = self.cierre_caja
             
+            partes = []
+            partes.append("="*80 + "\n")
+            partes.append("💰 CIERRE DE CAJA DEL DÍA\n")
+            partes.append("="*80 + "\n\n")
+            partes.append("🐺🐰 RESTAURANTE WOLFRABBIT - ¡La mejor Comida Salvaje de Chile! 🐺🐰\n\n")
+            
+            partes.append(f"Fecha de Cierre: {cierre.fecha_cierre.strftime('%d/%m/%Y %H:%M:%S')}\n")
+            partes.append("\n" + "-"*80 + "\n")
+            partes.append("RESUMEN ESTADÍSTICO:\n")
+            partes.append("-"*80 + "\n")
+            partes.append(f"Total de órdenes:        {cierre.total_ordenes}\n")
+            partes.append(f"Total de ingresos:       ${cierre.total_ingresos:,.0f}\n")
+            partes.append(f"Promedio por orden:      ${cierre.promedio_orden:,.0f}\n")
+            partes.append(f"Total de platillos:      {cierre.platillos_vendidos}\n")
+            
+            if cierre.categoria_mas_vendida:
+                categoria, cantidad = cierre.categoria_mas_vendida
+                partes.append(f"Categoría más vendida:   {categoria} ({cantidad} platillos)\n")
+            
+            partes.append("\n" + "-"*80 + "\n")
+            partes.append("DETALLES POR ORDEN:\n")
+            partes.append("-"*80 + "\n")
+            
+            for orden in cierre.ordenes:
+                partes.append(FORMATO_LINEA_CIERRE.format(orden.numero_orden, orden.cliente, orden.total) + "\n")
+            
+            partes.append("\n" + "="*80 + "\n")
+            partes.append(f"{'TOTAL FINAL:':<40} ${cierre.total_ingresos:>12,.0f}\n")
+            partes.append("="*80 + "\n")
+            
             with open(ruta_completa, 'w', encoding='utf-8') as archivo:
-                archivo.write("="*80 + "\n")
-                archivo.write("💰 CIERRE DE CAJA DEL DÍA\n")
-                archivo.write("="*80 + "\n\n")
-                archivo.write("🐺🐰 RESTAURANTE WOLFRABBIT - ¡La mejor Comida Salvaje de Chile! 🐺🐰\n\n")
-                
-                archivo.write(f"Fecha de Cierre: {cierre.fecha_cierre.strftime('%d/%m/%Y %H:%M:%S')}\n")
-                archivo.write("\n" + "-"*80 + "\n")
-                archivo.write("RESUMEN ESTADÍSTICO:\n")
-                archivo.write("-"*80 + "\n")
-                archivo.write(f"Total de órdenes:        {cierre.total_ordenes}\n")
-                archivo.write(f"Total de ingresos:       ${cierre.total_ingresos:,.0f}\n")
-                archivo.write(f"Promedio por orden:      ${cierre.promedio_orden:,.0f}\n")
-                archivo.write(f"Total de platillos:      {cierre.platillos_vendidos}\n")
-                
-                if cierre.categoria_mas_vendida:
-                    categoria, cantidad = cierre.categoria_mas_vendida
-                    archivo.write(f"Categoría más vendida:   {categoria} ({cantidad} platillos)\n")
-                
-                archivo.write("\n" + "-"*80 + "\n")
-                archivo.write("DETALLES POR ORDEN:\n")
-                archivo.write("-"*80 + "\n")
-                
-                for orden in cierre.ordenes:
-                    archivo.write(f"Orden #{orden.numero_orden:<3} - {orden.cliente:<20} ${orden.total:>12,.0f}\n")
-                
-                archivo.write("\n" + "="*80 + "\n")
-                archivo.write(f"{'TOTAL FINAL:':<40} ${cierre.total_ingresos:>12,.0f}\n")
-                archivo.write("="*80 + "\n")
+                archivo.write(''.join(partes))
             
-            print("\n" + "="*60)
-            print("✅ Cierre de caja guardado correctamente.")
-            print(f"📁 Ubicación: {ruta_completa}")
-            print(f"💰 Total guardado: ${cierre.total_ingresos:,.0f}")
-            print("="*60)
+            self._log("\n" + "="*60)
+            self._log("✅ Cierre de caja guardado correctamente.")
+            self._log(f"📁 Ubicación: {ruta_completa}")
+            self._log(f"💰 Total guardado: ${cierre.total_ingresos:,.0f}")
+            self._log("="*60)
             
         except Exception as e:
-            print(f"❌ Error al guardar el cierre de caja: {e}")
+            self._log(f"❌ Error al guardar el cierre de caja: {e}")
 
     def guardar_ordenes_completo(self):
         """Guarda un reporte completo de todas las órdenes"""
         if not self.ordenes:
-            print("❌ No hay órdenes registradas para guardar.")
+            self._log("❌ No hay órdenes registradas para guardar.")
             return
         
         try:
-            if not os.path.exists(CARPETA_ORDENES_GUARDADAS):
-                os.makedirs(CARPETA_ORDENES_GUARDADAS)
-            
-            fecha_actual = datetime.now().strftime("%Y-%m-%d")
+            ahora = datetime.now()
+            fecha_actual = ahora.strftime("%Y-%m-%d")
             ruta_fecha = os.path.join(CARPETA_ORDENES_GUARDADAS, fecha_actual)
+            # Crea la carpeta del día (y la carpeta principal) si aún no existen
+            os.makedirs(ruta_fecha, exist_ok=True)
             
-            if not os.path.exists(ruta_fecha):
-                os.makedirs(ruta_fecha)
-            
-            hora_actual = datetime.now().strftime("%H-%M-%S")
+            hora_actual = ahora.strftime("%H-%M-%S")
             nombre_archivo = f"listado_ordenes_{hora_actual}{EXTENSION}"
             ruta_completa = os.path.join(ruta_fecha, nombre_archivo)
             
-            with open(ruta_completa, 'w', encoding='utf-8') as archivo:
-                archivo.write("="*80 + "\n")
-                archivo.write(f"LISTADO COMPLETO DE ÓRDENES - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-                archivo.write("="*80 + "\n\n")
-                archivo.write("🐺🐰 RESTAURANTE WOLFRABBIT - ¡La mejor Comida Salvaje de Chile! 🐺🐰\n\n")
-                
-                for idx, orden in enumerate(self.ordenes, 1):
-                    archivo.write(f"--- ORDEN #{idx} ---\n")
-                    archivo.write(f"Número de Orden: {orden.numero_orden}\n")
-                    archivo.write(f"Cliente: {orden.cliente}\n")
-                    archivo.write(f"Fecha: {orden.fecha.strftime('%d/%m/%Y %H:%M:%S')}\n")
-                    archivo.write(f"{'-'*80}\n")
-                    archivo.write(f"DETALLE:\n")
-                    
-                    for item in orden.platillos:
-                        platillo = item['platillo']
-                        cantidad = item['cantidad']
-                        subtotal = item['subtotal']
-                        archivo.write(f"  {cantidad}x {platillo.nombre:<40} ${subtotal:>12,.0f}\n")
-                    
-                    archivo.write(f"{'-'*80}\n")
-                    archivo.write(f"{'TOTAL ORDEN:':<50} ${orden.total:>12,.0f}\n")
-                    archivo.write("\n")
+            partes = []
+            partes.append("="*80 + "\n")
+            partes.append(f"LISTADO COMPLETO DE ÓRDENES - {ahora.strftime('%d/%m/%Y %H:%M:%S')}\n")
+            partes.append("="*80 + "\n\n")
+            partes.append("🐺🐰 RESTAURANTE WOLFRABBIT - ¡La mejor Comida Salvaje de Chile! 🐺🐰\n\n")
+            
+            # Plantillas armadas una sola vez fuera del ciclo de órdenes
+            linea_item = "  {}x {:<40} ${:>12,.0f}\n"
+            linea_total = f"{'TOTAL ORDEN:':<50} ${{:>12,.0f}}\n"
+            separador = "-"*80 + "\n"
+            
+            for idx, orden in enumerate(self.ordenes.values(), 1):
+                partes.append(f"--- ORDEN #{idx} ---\n")
+                partes.append(f"Número de Orden: {orden.numero_orden}\n")
+                partes.append(f"Cliente: {orden.cliente}\n")
+                partes.append(f"Fecha: {orden.fecha.strftime('%d/%m/%Y %H:%M:%S')}\n")
+                partes.append(separador)
+                partes.append(f"DETALLE:\n")
                 
-                archivo.write("="*80 + "\n")
-                archivo.write("RESUMEN ESTADÍSTICO:\n")
-                total_ingresos = sum(orden.total for orden in self.ordenes)
-                cantidad_ordenes = len(self.ordenes)
-                promedio_orden = total_ingresos / cantidad_ordenes if cantidad_ordenes > 0 else 0
+                for item in orden.platillos:
+                    partes.append(linea_item.format(item.cantidad, item.platillo.nombre, item.subtotal))
                 
-                archivo.write(f"Total de órdenes: {cantidad_ordenes}\n")
-                archivo.write(f"Total de ingresos: ${total_ingresos:,.0f}\n")
-                archivo.write(f"Promedio por orden: ${promedio_orden:,.0f}\n")
-                archivo.write("="*80 + "\n")
+                partes.append(separador)
+                partes.append(linea_total.format(orden.total))
+                partes.append("\n")
+            
+            partes.append("="*80 + "\n")
+            partes.append("RESUMEN ESTADÍSTICO:\n")
+            total_ingresos = self.total_ingresos
+            cantidad_ordenes = self.total_ordenes
+            promedio_orden = total_ingresos / cantidad_ordenes if cantidad_ordenes > 0 else 0
+            
+            partes.append(f"Total de órdenes: {cantidad_ordenes}\n")
+            partes.append(f"Total de ingresos: ${total_ingresos:,.0f}\n")
+            partes.append(f"Promedio por orden: ${promedio_orden:,.0f}\n")
+            partes.append("="*80 + "\n")
+            
+            # Todo el reporte se escribe en una sola operación
+            with open(ruta_completa, 'w', encoding='utf-8') as archivo:
+                archivo.write(''.join(partes))
             
-            print("\n" + "="*60)
-            print("✅ Órdenes guardadas correctamente.")
-            print(f"📁 Ubicación: {ruta_completa}")
-            print(f"📊 Total de órdenes guardadas: {len(self.ordenes)}")
-            print("="*60)
+            self._log("\n" + "="*60)
+            self._log("✅ Órdenes guardadas correctamente.")
+            self._log(f"📁 Ubicación: {ruta_completa}")
+            self._log(f"📊 Total de órdenes guardadas: {self.total_ordenes}")
+            self._log("="*60)
             
         except Exception as e:
-            print(f"❌ Error al guardar las órdenes: {e}")
+            self._log(f"❌ Error al guardar las órdenes: {e}")
 
     def eliminar_listado_ordenes(self):
         """Elimina completamente el listado de órdenes del sistema"""
-        print("\n" + "="*60)
-        print("⚠️  ELIMINAR LISTADO COMPLETO DE ÓRDENES")
-        print("="*60)
+        self._log("\n" + "="*60)
+        self._log("⚠️  ELIMINAR LISTADO COMPLETO DE ÓRDENES")
+        self._log("="*60)
         
         if not self.ordenes:
-            print("❌ No hay órdenes registradas para eliminar.")
+            self._log("❌ No hay órdenes registradas para eliminar.")
             return
         
-        total_ordenes = len(self.ordenes)
-        total_ingresos = sum(orden.total for orden in self.ordenes)
-        
-        print(f"\n📊 Total de órdenes registradas: {total_ordenes}")
-        print(f"💰 Total de ingresos: ${total_ingresos:,.0f}")
-        print("\n⚠️  ADVERTENCIA: Esta acción eliminará TODAS las órdenes del sistema.")
-        print("   Los archivos individuales también serán eliminados.")
+        self._log(f"\n📊 Total de órdenes registradas: {self.total_ordenes}")
+        self._log(f"💰 Total de ingresos: ${self.total_ingresos:,.0f}")
+        self._log("\n⚠️  ADVERTENCIA: Esta acción eliminará TODAS las órdenes del sistema.")
+        self._log("   Los archivos individuales también serán eliminados.")
         
-        confirmacion = input("\n¿Está seguro de eliminar TODO el listado de órdenes? (s/n): ").strip().lower()
-        
-        if confirmacion == 's':
+        if self._confirmar("\n¿Está seguro de eliminar TODO el listado de órdenes? (s/n): "):
             try:
                 archivos_eliminados = 0
                 if os.path.exists(CARPETA_ORDENES):
-                    archivos = os.listdir(CARPETA_ORDENES)
-                    for archivo in archivos:
-                        if archivo.endswith(EXTENSION):
-                            os.remove(CARPETA_ORDENES + archivo)
-                            archivos_eliminados += 1
+                    with os.scandir(CARPETA_ORDENES) as entradas:
+                        for entrada in entradas:
+                            if entrada.is_file() and entrada.name.endswith(EXTENSION):
+                                os.remove(entrada.path)
+                                archivos_eliminados += 1
                 
                 self.ordenes.clear()
+                self._agg_total = 0
+                self._agg_items = 0
+                self._agg_cats.clear()
                 self.contador_ordenes = 1
                 self.cierre_caja = None
                 
-                print(f"\n✅ Listado de órdenes eliminado correctamente.")
-                print(f"📁 {archivos_eliminados} archivo(s) eliminado(s) del directorio.")
-                print(f"🔄 Contador de órdenes reiniciado a: 1")
+                self._log(f"\n✅ Listado de órdenes eliminado correctamente.")
+                self._log(f"📁 {archivos_eliminados} archivo(s) eliminado(s) del directorio.")
+                self._log(f"🔄 Contador de órdenes reiniciado a: 1")
                 
             except Exception as e:
-                print(f"\n❌ Error al eliminar el listado: {e}")
+                self._log(f"\n❌ Error al eliminar el listado: {e}")
         else:
-            print("\n❌ Eliminación cancelada.")
+            self._log("\n❌ Eliminación cancelada.")
 
     # ==================== PERSISTENCIA ====================
 
     def guardar_platillo(self, platillo):
-        """Guarda un platillo en un archivo .txt"""
-        with open(CARPETA_PLATILLOS + platillo.id_platillo + EXTENSION, 'w', encoding='utf-8') as archivo:
-            archivo.write(f'ID: {platillo.id_platillo}\n')
-            archivo.write(f'Nombre: {platillo.nombre}\n')
-            archivo.write(f'Precio: {platillo.precio}\n')
-            archivo.write(f'Categoría: {platillo.categoria}\n')
-            archivo.write(f'Disponible: {platillo.disponible}\n')
+        """Guarda un platillo nuevo en el archivo de platillos"""
+        self._guardar_platillos()
 
     def actualizar_platillo(self, platillo):
-        """Actualiza un platillo en el archivo .txt"""
-        self.guardar_platillo(platillo)
+        """Actualiza un platillo en el archivo de platillos"""
+        self._guardar_platillos()
+
+    def _guardar_platillos(self):
+        """Guarda todos los platillos en un único archivo JSON"""
+        # Si el menú no se pudo cargar no se guarda nada, para no sobrescribir el archivo con datos incompletos
+        if self._platillos is None:
+            raise RuntimeError(f"El menú no está cargado; no se guardarán cambios en {ARCHIVO_PLATILLOS}.")
+        self._escribir_platillos(self._platillos)
+
+    def _escribir_platillos(self, platillos):
+        """Escribe los platillos indicados en el archivo JSON"""
+        datos = {id_platillo: platillo.a_diccionario() for id_platillo, platillo in platillos.items()}
+        # La carpeta se crea aquí porque un script puede usar Restaurant sin pasar por app()
+        os.makedirs(os.path.dirname(ARCHIVO_PLATILLOS), exist_ok=True)
+        # Se escribe en un archivo temporal y luego se reemplaza, así nunca queda a medio escribir
+        ruta_temporal = ARCHIVO_PLATILLOS + '.tmp'
+        with open(ruta_temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo, ensure_ascii=False, indent=4)
+        os.replace(ruta_temporal, ARCHIVO_PLATILLOS)
 
     def guardar_orden(self, orden):
         """Guarda una orden en un archivo .txt con formato de ticket"""
-        nombre_archivo = f'orden_{orden.numero_orden:04d}_{orden.fecha.strftime("%Y%m%d_%H%M%S")}'
+        nombre_archivo = f'{PREFIJO_ORDEN}{orden.numero_orden:04d}_{orden.fecha.strftime("%Y%m%d_%H%M%S")}'
+        # Se arma el ticket completo en memoria y se escribe con una sola llamada
+        buf = []
+        buf.append(f'ORDEN #{orden.numero_orden}\n')
+        buf.append(f'{"="*50}\n')
+        buf.append(f'Cliente: {orden.cliente}\n')
+        buf.append(f'Fecha: {orden.fecha_str}\n')
+        buf.append(f'{"-"*50}\n\n')
+        buf.append(f'DETALLE DE LA ORDEN:\n')
+        buf.append(f'{"-"*50}\n')
+        
+        for item in orden.platillos:
+            platillo = item.platillo
+            cantidad = item.cantidad
+            subtotal = item.subtotal
+            buf.append(f'{cantidad}x {platillo.nombre:<30} ${subtotal:>10,.0f}\n')
+        
+        buf.append(f'{"-"*50}\n')
+        buf.append(f'{"TOTAL:":<35} ${orden.total:>10,.0f}\n')
+        buf.append(f'{"="*50}\n')
+        
+        # La carpeta se crea aquí porque un script puede usar Restaurant sin pasar por app()
+        os.makedirs(CARPETA_ORDENES, exist_ok=True)
         with open(CARPETA_ORDENES + nombre_archivo + EXTENSION, 'w', encoding='utf-8') as archivo:
-            archivo.write(f'ORDEN #{orden.numero_orden}\n')
-            archivo.write(f'{"="*50}\n')
-            archivo.write(f'Cliente: {orden.cliente}\n')
-            archivo.write(f'Fecha: {orden.fecha.strftime("%d/%m/%Y %H:%M")}\n')
-            archivo.write(f'{"-"*50}\n\n')
-            archivo.write(f'DETALLE DE LA ORDEN:\n')
-            archivo.write(f'{"-"*50}\n')
-            
-            for item in orden.platillos:
-                platillo = item['platillo']
-                cantidad = item['cantidad']
-                subtotal = item['subtotal']
-                archivo.write(f'{cantidad}x {platillo.nombre:<30} ${subtotal:>10,.0f}\n')
-            
-            archivo.write(f'{"-"*50}\n')
-            archivo.write(f'{"TOTAL:":<35} ${orden.total:>10,.0f}\n')
-            archivo.write(f'{"="*50}\n')
+            archivo.write(''.join(buf))
 
     def cargar_datos(self):
-        """Carga todos los datos desde archivos al iniciar el sistema"""
+        """Carga de inmediato todos los datos desde archivos (normalmente se cargan al primer uso)"""
         self.cargar_platillos()
         self.cargar_ordenes()
 
     def cargar_platillos(self):
-        """Carga todos los platillos desde archivos .txt"""
+        """
+        Carga todos los platillos desde el archivo JSON.
+        Si el archivo está dañado se lanza ValueError y el menú queda sin cargar,
+        así ningún guardado posterior puede sobrescribirlo con datos incompletos.
+        """
+        if os.path.exists(ARCHIVO_PLATILLOS):
+            self._platillos = self._leer_platillos_json()
+        else:
+            # Si aún no existe el archivo JSON se migran los platillos guardados en .txt.
+            # El menú se da por cargado solo después de guardarlos; si falla se reintenta al próximo uso
+            platillos = self.cargar_platillos_txt()
+            if platillos:
+                self._escribir_platillos(platillos)
+            self._platillos = platillos
+
+        self._indexar_menu()
+
+    def _leer_platillos_json(self):
+        """Lee el archivo JSON y devuelve los platillos indexados por ID"""
+        try:
+            with open(ARCHIVO_PLATILLOS, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            return {id_platillo: Platillo(**d) for id_platillo, d in datos.items()}
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"El archivo {ARCHIVO_PLATILLOS} está dañado y no se pudo cargar ({e}). "
+                             "Repárelo o restáurelo antes de modificar el menú.") from e
+
+    def migrar_platillos_txt(self):
+        """
+        Importa los platillos .txt antiguos que aún no están en el archivo JSON.
+        Los platillos que ya existen no se tocan: sus ediciones solo se guardan
+        en el JSON, así que los .txt pueden estar desactualizados.
+        """
+        platillos = self._platillos
+        if platillos is None:
+            # Se lee el JSON directamente para no disparar la migración automática
+            platillos = self._leer_platillos_json() if os.path.exists(ARCHIVO_PLATILLOS) else {}
+
+        nuevos = {id_platillo: platillo for id_platillo, platillo in self.cargar_platillos_txt().items()
+                  if id_platillo not in platillos}
+
+        # El menú en memoria se actualiza solo si el archivo se guardó bien
+        if nuevos:
+            self._escribir_platillos({**platillos, **nuevos})
+            platillos.update(nuevos)
+        self._platillos = platillos
+        self._indexar_menu()
+        self._log(f"✅ Migración completada: {len(nuevos)} platillo(s) nuevo(s) en {ARCHIVO_PLATILLOS}.")
+
+    def _indexar_menu(self):
+        """Reconstruye el índice de categorías con todos los platillos cargados"""
+        self._platillos_por_categoria = defaultdict(list)
+        self._categorias_ordenadas = []
+        for platillo in self.platillos.values():
+            self._indexar_platillo(platillo)
+        self._menu_version += 1
+
+    def cargar_platillos_txt(self):
+        """Lee los platillos de los archivos .txt de versiones anteriores y los devuelve indexados por ID"""
+        platillos = {}
         if not os.path.exists(CARPETA_PLATILLOS):
-            return
+            return platillos
 
-        archivos = os.listdir(CARPETA_PLATILLOS)
-        
-        for archivo in archivos:
-            if archivo.endswith(EXTENSION):
+        with os.scandir(CARPETA_PLATILLOS) as entradas:
+            archivos = [entrada for entrada in entradas
+                        if entrada.is_file() and entrada.name.endswith(EXTENSION)]
+        if not archivos:
+            return platillos
+
+        # Los archivos se leen en paralelo: el tiempo se va en abrir y leer cada archivo
+        with ThreadPoolExecutor(max_workers=min(32, len(archivos))) as executor:
+            lecturas = [(entrada, executor.submit(leer_platillo_txt, entrada.path)) for entrada in archivos]
+            for entrada, lectura in lecturas:
                 try:
-                    with open(CARPETA_PLATILLOS + archivo, 'r', encoding='utf-8') as f:
-                        lineas = f.readlines()
-                        id_platillo = lineas[0].split(': ')[1].strip()
-                        nombre = lineas[1].split(': ')[1].strip()
-                        precio = float(lineas[2].split(': ')[1].strip())
-                        categoria = lineas[3].split(': ')[1].strip()
-                        disponible = lineas[4].split(': ')[1].strip() == 'True'
-                        
-                        platillo = Platillo(id_platillo, nombre, precio, categoria)
-                        platillo.disponible = disponible
-                        self.platillos[id_platillo] = platillo
+                    platillo = lectura.result()
+                    platillos[platillo.id_platillo] = platillo
                 except Exception as e:
-                    print(f"Error cargando platillo {archivo}: {e}")
+                    log.warning("Error cargando platillo %s: %s", entrada.name, e)
+        return platillos
 
     def cargar_ordenes(self):
         """Carga las órdenes desde archivos y actualiza el contador de órdenes"""
         if not os.path.exists(CARPETA_ORDENES):
             return
 
-        archivos = os.listdir(CARPETA_ORDENES)
+        # Los archivos se llaman orden_0001_AAAAMMDD_HHMMSS.txt; los que no calzan se ignoran
+        inicio_numero = len(PREFIJO_ORDEN)
         max_orden = 0
         
-        for archivo in archivos:
-            if archivo.endswith(EXTENSION):
-                try:
-                    partes = archivo.replace(EXTENSION, '').split('_')
-                    if len(partes) >= 2:
-                        numero_orden = int(partes[1])
-                        if numero_orden > max_orden:
-                            max_orden = numero_orden
-                except Exception as e:
-                    print(f"Error procesando {archivo}: {e}")
+        with os.scandir(CARPETA_ORDENES) as entradas:
+            for entrada in entradas:
+                nombre = entrada.name
+                if not (nombre.startswith(PREFIJO_ORDEN) and nombre.endswith(EXTENSION)):
+                    continue
+                numero = nombre[inicio_numero:].partition('_')[0]
+                if numero.isdecimal():
+                    max_orden = max(max_orden, int(numero))
         
         self.contador_ordenes = max_orden + 1
 
 
 # ==================== FUNCIONES AUXILIARES ====================
 
+def leer_platillo_txt(ruta):
+    """Lee un platillo desde un archivo .txt con líneas en formato Clave: valor"""
+    with open(ruta, 'r', encoding='utf-8') as f:
+        contenido = f.read()
+    
+    # Solo interesan las 5 primeras líneas (ID, Nombre, Precio, Categoría y Disponible)
+    campos = {}
+    for linea in contenido.split('\n', 5)[:5]:
+        clave, _, valor = linea.partition(': ')
+        campos[clave] = valor.strip()
+    
+    return Platillo(campos['ID'], campos['Nombre'], float(campos['Precio']),
+                    campos['Categoría'], campos['Disponible'] in VALORES_VERDADEROS)
+
+
 def crear_directorios():
     """Crea los directorios necesarios para almacenar los archivos si no existen"""
     directorios = [CARPETA_PLATILLOS, CARPETA_ORDENES, CARPETA_ORDENES_GUARDADAS, CARPETA_CIERRE_CAJA]
     for directorio in directorios:
-        if not os.path.exists(directorio):
-            os.makedirs(directorio)
+        os.makedirs(directorio, exist_ok=True)
+
+
+# Texto del menú principal, armado una sola vez al cargar el módulo
+MENU_PRINCIPAL = "\n".join([
+    "\n" + "="*60,
+    '\n🐺🐰 Bienvenidos al Restaurante WolfRabbit!! 🐺🐰',
+    '¡La mejor Comida Salvaje de Chile!\n',
+    "="*60,
+    "\n" + "="*60,
+    "🍽️  SISTEMA DE GESTIÓN DE RESTAURANT 🍽️",
+    "="*60,
+    "\n--- GESTIÓN DE PLATILLOS ---",
+    "1.  Agregar Platillo",
+    "2.  Mostrar Menú (Todos los Platillos)",
+    "3.  Buscar Platillo",
+    "4.  Editar Platillo",
+    "5.  Eliminar Platillo",
+    "\n--- GESTIÓN DE ÓRDENES ---",
+    "6.  Crear Nueva Orden",
+    "7.  Mostrar Todas las Órdenes",
+    "8.  Buscar Orden",
+    "9.  Eliminar Orden",
+    "\n--- REPORTES Y ÓRDENES GUARDADAS ---",
+    "10. Guardar Listado de Órdenes",
+    "11. Eliminar Listado de Órdenes",
+    "\n--- CIERRE DE CAJA ---",
+    "12. Generar Cierre de Caja",
+    "13. Mostrar Cierre de Caja",
+    "14. Guardar Cierre de Caja",
+    "\n--- SISTEMA ---",
+    "0.  Salir del Sistema",
+    "="*60,
+]) + "\n"
 
 
 def mostrar_menu():
     """Muestra el menú principal del sistema con todas las opciones disponibles"""
-    print("\n" + "="*60)
-    print('\n🐺🐰 Bienvenidos al Restaurante WolfRabbit!! 🐺🐰')
-    print('¡La mejor Comida Salvaje de Chile!\n')
-    print("="*60)
-    print("\n" + "="*60)
-    print("🍽️  SISTEMA DE GESTIÓN DE RESTAURANT 🍽️")
-    print("="*60)
-    print("\n--- GESTIÓN DE PLATILLOS ---")
-    print("1.  Agregar Platillo")
-    print("2.  Mostrar Menú (Todos los Platillos)")
-    print("3.  Buscar Platillo")
-    print("4.  Editar Platillo")
-    print("5.  Eliminar Platillo")
-    print("\n--- GESTIÓN DE ÓRDENES ---")
-    print("6.  Crear Nueva Orden")
-    print("7.  Mostrar Todas las Órdenes")
-    print("8.  Buscar Orden")
-    print("9.  Eliminar Orden")
-    print("\n--- REPORTES Y ÓRDENES GUARDADAS ---")
-    print("10. Guardar Listado de Órdenes")
-    print("11. Eliminar Listado de Órdenes")
-    print("\n--- CIERRE DE CAJA ---")
-    print("12. Generar Cierre de Caja")
-    print("13. Mostrar Cierre de Caja")
-    print("14. Guardar Cierre de Caja")
-    print("\n--- SISTEMA ---")
-    print("0.  Salir del Sistema")
-    print("="*60)
+    sys.stdout.write(MENU_PRINCIPAL)
+    sys.stdout.flush()
+
+
+# ==================== OPCIONES DEL MENÚ ====================
+
+def opcion_agregar_platillo(restaurant):
+    """Opción 1: pide los datos de un platillo nuevo y lo agrega"""
+    print("\n--- AGREGAR PLATILLO ---")
+    id_platillo = input("ID del platillo (ej: P001): ").strip()
+    nombre = input("Nombre del platillo: ").strip()
+    precio = input("Precio: ").strip()
+    categoria = input("Categoría (Entrada/Plato Fuerte/Postre/Bebida): ").strip()
+    restaurant.agregar_platillo(id_platillo, nombre, precio, categoria)
+
+
+def opcion_con_dato(titulo, pregunta, metodo):
+    """Devuelve una opción que muestra el título, pide un dato y se lo entrega al método del restaurant"""
+    def opcion(restaurant):
+        print("\n" + titulo)
+        metodo(restaurant, input(pregunta).strip())
+    return opcion
+
+
+def con_pausa(metodo):
+    """Devuelve una opción que ejecuta el método del restaurant y luego espera Enter"""
+    def opcion(restaurant):
+        metodo(restaurant)
+        restaurant.pausar()
+    return opcion
+
+
+# Cada opción del menú principal con la función que la atiende
+OPCIONES = {
+    '1': opcion_agregar_platillo,
+    '2': Restaurant.mostrar_platillos,
+    '3': opcion_con_dato("--- BUSCAR PLATILLO ---", "ID del platillo: ", Restaurant.buscar_platillo),
+    '4': opcion_con_dato("--- EDITAR PLATILLO ---", "ID del platillo a editar: ", Restaurant.editar_platillo),
+    '5': opcion_con_dato("--- ELIMINAR PLATILLO ---", "ID del platillo a eliminar: ", Restaurant.eliminar_platillo),
+    '6': Restaurant.crear_orden,
+    '7': Restaurant.mostrar_ordenes,
+    '8': opcion_con_dato("--- BUSCAR ORDEN ---", "Número de orden: ", Restaurant.buscar_orden),
+    '9': opcion_con_dato("--- ELIMINAR/CANCELAR ORDEN ---", "Número de orden a eliminar: ", Restaurant.eliminar_orden),
+    '10': con_pausa(Restaurant.guardar_ordenes_completo),
+    '11': con_pausa(Restaurant.eliminar_listado_ordenes),
+    '12': con_pausa(Restaurant.generar_cierre_caja),
+    '13': con_pausa(Restaurant.mostrar_cierre_caja),
+    '14': con_pausa(Restaurant.guardar_cierre_caja),
+}
 
 
 # ==================== FUNCIÓN PRINCIPAL ====================
 
-def app():
-    """Función principal que ejecuta el sistema del restaurant"""
+def app(migrar=False):
+    """
+    Función principal que ejecuta el sistema del restaurant.
+    Con migrar=True se importan los platillos .txt antiguos que falten en el archivo JSON.
+    """
     crear_directorios()
     
     restaurant = Restaurant()
+    if migrar:
+        restaurant.migrar_platillos_txt()
     
     print("✅ Sistema de restaurant iniciado correctamente.")
-    if restaurant.platillos:
-        print(f"📊 Se cargaron {len(restaurant.platillos)} platillos del menú.")
-    if restaurant.ordenes:
-        print(f"📋 Se cargaron {len(restaurant.ordenes)} órdenes del historial.")
     
     while True:
         mostrar_menu()
@@ -793,69 +1136,7 @@ def app():
         try:
             opcion = input("\nSeleccione una opción (0-14): ").strip()
             
-            if opcion == '1':
-                print("\n--- AGREGAR PLATILLO ---")
-                id_platillo = input("ID del platillo (ej: P001): ").strip()
-                nombre = input("Nombre del platillo: ").strip()
-                precio = input("Precio: ").strip()
-                categoria = input("Categoría (Entrada/Plato Fuerte/Postre/Bebida): ").strip()
-                restaurant.agregar_platillo(id_platillo, nombre, precio, categoria)
-            
-            elif opcion == '2':
-                restaurant.mostrar_platillos()
-            
-            elif opcion == '3':
-                print("\n--- BUSCAR PLATILLO ---")
-                id_platillo = input("ID del platillo: ").strip()
-                restaurant.buscar_platillo(id_platillo)
-            
-            elif opcion == '4':
-                print("\n--- EDITAR PLATILLO ---")
-                id_platillo = input("ID del platillo a editar: ").strip()
-                restaurant.editar_platillo(id_platillo)
-            
-            elif opcion == '5':
-                print("\n--- ELIMINAR PLATILLO ---")
-                id_platillo = input("ID del platillo a eliminar: ").strip()
-                restaurant.eliminar_platillo(id_platillo)
-            
-            elif opcion == '6':
-                restaurant.crear_orden()
-            
-            elif opcion == '7':
-                restaurant.mostrar_ordenes()
-            
-            elif opcion == '8':
-                print("\n--- BUSCAR ORDEN ---")
-                numero_orden = input("Número de orden: ").strip()
-                restaurant.buscar_orden(numero_orden)
-            
-            elif opcion == '9':
-                print("\n--- ELIMINAR/CANCELAR ORDEN ---")
-                numero_orden = input("Número de orden a eliminar: ").strip()
-                restaurant.eliminar_orden(numero_orden)
-            
-            elif opcion == '10':
-                restaurant.guardar_ordenes_completo()
-                input("\nPresione Enter para volver al menú...")
-            
-            elif opcion == '11':
-                restaurant.eliminar_listado_ordenes()
-                input("\nPresione Enter para volver al menú...")
-            
-            elif opcion == '12':
-                restaurant.generar_cierre_caja()
-                input("\nPresione Enter para volver al menú...")
-            
-            elif opcion == '13':
-                restaurant.mostrar_cierre_caja()
-                input("\nPresione Enter para volver al menú...")
-            
-            elif opcion == '14':
-                restaurant.guardar_cierre_caja()
-                input("\nPresione Enter para volver al menú...")
-            
-            elif opcion == '0':
+            if opcion == '0':
                 print("\n" + "="*60)
                 print("👋 ¡Gracias por usar el sistema de restaurant!")
                 print("📁 Todos los datos han sido guardados correctamente.")
@@ -863,6 +1144,9 @@ def app():
                 print("="*60)
                 break
             
+            accion = OPCIONES.get(opcion)
+            if accion:
+                accion(restaurant)
             else:
                 print("❌ Opción inválida. Por favor seleccione entre 0-14.")
         
@@ -878,7 +1162,8 @@ if __name__ == "__main__":
     """
     Punto de entrada del programa
     Se ejecuta solo si el archivo se ejecuta directamente
+    Uso: python Restaurante.py [--migrar]
     """
-    app()
+    app(migrar='--migrar' in sys.argv)
 
 